@@ -0,0 +1,119 @@
+"""
+Dose calculations for the OPA Med Calculator.
+Pure numeric code with no Streamlit dependency, so it can be imported,
+compiled and cached independently of the UI in App.py.
+"""
+import numpy as np
+
+try:
+    from numba import njit, types
+except ImportError:  # Without Numba, _dose_kernel_numpy is used instead
+    njit = None
+
+# Conversion factor
+LBS_TO_KG = 0.453592
+
+# --- DRUG LOOKUP TABLE (REVISED) ---
+# Data structure: one column per field, row i describes NAMES[i]
+# RATES: Dose Rate in mg/kg
+# CONCS: Concentration/Pill Size in mg/unit
+# For liquids: Concentration is mg/mL
+# For pills: Concentration represents the size of the pill available (mg/pill)
+# UNITS: Output unit ("mL" or "Pill")
+NAMES = [
+    "Select a Medication",
+    "Toltrazuril (Tolt)",
+    "Panacur (Fenbendazole)",
+    # Doxy is now treated as a pill/tablet. 
+    # 50.0 is the available pill size in mg (e.g., 50mg tablets).
+    "Doxycycline (Pill)",
+]
+RATES = np.array([0.0, 33.0, 50.0, 5.0], dtype=np.float64)
+CONCS = np.array([0.0, 50.0, 100.0, 50.0], dtype=np.float64)
+UNITS = np.array(["mL", "mL", "mL", "Pill"])
+
+# Drug name -> row index into the columns above
+DRUG_INDEX = {name: i for i, name in enumerate(NAMES)}
+
+# Dose (unit) per LB of body weight for each drug, computed once at import.
+# Rows with no concentration (e.g. "Select a Medication") get a 0.0 factor.
+FACTORS = np.divide(
+    LBS_TO_KG * RATES, CONCS, out=np.zeros_like(RATES), where=CONCS > 0
+)
+
+def calculate_dose(weight_kg, dose_rate_mg_kg, concentration_mg_unit, unit_type):
+    """
+    Calculates the final dose (mL or Pill) of medication needed for one animal.
+    This is the reference dose definition: dose_kernel must give the same
+    result for every weight (checked in test_dose_core.py).
+    """
+    if concentration_mg_unit <= 0 or weight_kg <= 0 or dose_rate_mg_kg <= 0:
+        return 0.0, "mL" # Return 0.0 and a default unit
+    
+    # 1. Calculate the total Milligrams (mg) needed for the animal
+    total_mg_needed = weight_kg * dose_rate_mg_kg
+    
+    # 2. Calculate the final dose amount
+    # Formula: Dose (unit) = Total mg needed / Concentration (mg/unit)
+    final_dose = total_mg_needed / concentration_mg_unit
+    
+    # 3. Rounding for practical use
+    if unit_type == "Pill":
+        # Rounding to two decimals for pills allows for 1/4 or 1/2 pill dosing (e.g., 0.5 or 0.25)
+        rounded_dose = round(final_dose, 2)
+    else: # mL (liquid)
+        # Keep rounding to two decimals for liquid volume
+        rounded_dose = round(final_dose, 2)
+        
+    return rounded_dose, unit_type
+
+def dose_factor(dose_rate_mg_kg, concentration_mg_unit):
+    """
+    Returns the dose (mL or Pill) per LB of body weight for a medication.
+    Constant across a litter, so it is computed once and validated once.
+    """
+    if concentration_mg_unit <= 0 or dose_rate_mg_kg <= 0:
+        return 0.0
+
+    # Dose (unit) per lb = (kg per lb * mg per kg) / mg per unit
+    return LBS_TO_KG * dose_rate_mg_kg / concentration_mg_unit
+
+# --- DOSE KERNEL ---
+# Computes every dose for a litter plus the litter total in one pass.
+# Non-positive weights get a 0.0 dose, as in calculate_dose, and so do NaN and
+# infinite weights, which have no integer hundredths to round to.
+# Doses are rounded to whole hundredths (int64 "cents") and summed as integers,
+# so the litter total is exact and callers display it as-is.
+# Both kernels scale by weight_lbs * (factor * 100.0), in that order, so they
+# agree on values that land exactly on a rounding boundary.
+def _dose_kernel_numpy(weights_lbs, factor):
+    # Zero out unusable weights, scale in place, then round to integer hundredths
+    scaled = np.where(np.isfinite(weights_lbs) & (weights_lbs > 0), weights_lbs, 0.0)
+    np.multiply(scaled, factor * 100.0, out=scaled)
+    cents = np.rint(scaled).astype(np.int64)
+    return cents / 100.0, int(cents.sum()) / 100.0
+
+if njit is not None:
+    # Eager signature compiles at import, and cache=True keeps the machine code
+    # on disk, so the first "Calculate Doses" click doesn't stall on compilation.
+    # No fastmath: it would let LLVM reorder the multiplies and replace the
+    # divide by 100 with a reciprocal multiply, changing displayed doses.
+    # Weights are typed as read-only, any-layout arrays so the kernel takes the
+    # same inputs as the NumPy one (e.g. read-only views from pandas to_numpy()).
+    _weights_type = types.Array(types.float64, 1, "A", readonly=True)
+
+    @njit(types.Tuple((types.float64[::1], types.float64))(_weights_type, types.float64), cache=True)
+    def dose_kernel(weights_lbs, factor):
+        doses = np.empty(weights_lbs.size, dtype=np.float64)
+        total_cents = 0
+        for i in range(weights_lbs.size):
+            weight_lbs = weights_lbs[i]
+            if np.isfinite(weight_lbs) and weight_lbs > 0:
+                cents = np.int64(np.rint(weight_lbs * (factor * 100.0)))
+            else:
+                cents = 0
+            doses[i] = cents / 100.0
+            total_cents += cents
+        return doses, total_cents / 100.0
+else:
+    dose_kernel = _dose_kernel_numpy
@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dose_core
+
+# The compiled kernel is only a separate function when Numba is installed
+KERNELS = [dose_core._dose_kernel_numpy]
+if dose_core.dose_kernel is not dose_core._dose_kernel_numpy:
+    KERNELS.append(dose_core.dose_kernel)
+
+# (dose rate mg/kg, concentration mg/unit, unit) for every preset plus a custom dose
+DRUGS = [
+    (dose_core.RATES[i], dose_core.CONCS[i], str(dose_core.UNITS[i]))
+    for i in range(1, len(dose_core.NAMES))
+] + [(12.5, 7.3, "mL")]
+
+
+def expected_doses(weights_lbs, dose_rate, concentration, unit_type):
+    """Per-animal doses from the scalar reference, calculate_dose."""
+    return [
+        dose_core.calculate_dose(
+            weight_lbs * dose_core.LBS_TO_KG, dose_rate, concentration, unit_type
+        )[0]
+        for weight_lbs in weights_lbs
+    ]
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+@pytest.mark.parametrize("drug", DRUGS)
+def test_kernel_matches_calculate_dose(kernel, drug):
+    rng = np.random.default_rng(0)
+    weights_lbs = rng.uniform(0.1, 60.0, size=10_000)
+    factor = dose_core.dose_factor(drug[0], drug[1])
+
+    doses, total = kernel(weights_lbs, factor)
+
+    expected = expected_doses(weights_lbs, *drug)
+    np.testing.assert_array_equal(doses, expected)
+    assert total == round(math.fsum(expected), 2)
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_kernel_gives_zero_dose_for_non_positive_weights(kernel):
+    weights_lbs = np.array([0.0, -2.5, 3.1, -0.0, np.nan, np.inf, -np.inf])
+    factor = dose_core.FACTORS[1]
+
+    doses, total = kernel(weights_lbs, factor)
+
+    np.testing.assert_array_equal(doses, [0.0, 0.0, 0.93, 0.0, 0.0, 0.0, 0.0])
+    assert doses[2] == expected_doses([3.1], *DRUGS[0])[0]
+    assert total == 0.93
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_kernel_handles_empty_litter(kernel):
+    doses, total = kernel(np.empty(0, dtype=np.float64), dose_core.FACTORS[1])
+
+    assert doses.size == 0
+    assert total == 0.0
+
+
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_kernel_accepts_read_only_and_strided_weights(kernel):
+    factor = dose_core.FACTORS[1]
+    read_only = pd.Series([2.5, 3.1]).to_numpy()
+    read_only.flags.writeable = False
+    strided = np.array([2.5, 99.0, 3.1])[::2]
+
+    for weights_lbs in (read_only, strided):
+        doses, total = kernel(weights_lbs, factor)
+
+        np.testing.assert_array_equal(doses, [0.75, 0.93])
+        assert total == 1.68
+
+
+def test_compiled_kernel_matches_numpy_kernel():
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(0)
+    weights_lbs = rng.uniform(-5.0, 60.0, size=10_000)
+
+    for factor in dose_core.FACTORS[1:]:
+        doses, total = dose_core.dose_kernel(weights_lbs, factor)
+        numpy_doses, numpy_total = dose_core._dose_kernel_numpy(weights_lbs, factor)
+        np.testing.assert_array_equal(doses, numpy_doses)
+        assert total == numpy_total